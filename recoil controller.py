@@ -4,9 +4,15 @@ import sys
 import os
 import json
 import time
+import ctypes
+from ctypes import wintypes
+import queue
+import functools
 import logging
-from dataclasses import dataclass, asdict
-from threading import Event, Lock
+from logging.handlers import QueueHandler, QueueListener, MemoryHandler
+from contextlib import ExitStack
+from dataclasses import dataclass
+from threading import Event
 from typing import Dict, Any, Optional
 
 from PyQt5.QtWidgets import (
@@ -14,51 +20,164 @@ from PyQt5.QtWidgets import (
     QPushButton, QVBoxLayout, QHBoxLayout, QListWidget, QFrame,
     QMessageBox, QLineEdit, QFileDialog, QSlider, QGroupBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QObject, QTimer
+from PyQt5.QtCore import (
+    QThread, pyqtSignal, Qt, QObject, QTimer, QEvent, QSignalBlocker,
+    QSaveFile, QIODevice, QRunnable, QThreadPool
+)
 from PyQt5.QtGui import QPalette, QColor, QFont
 
 from pynput import mouse, keyboard
-import win32api, win32con
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.expanduser("~"), "recoil_controller.log")),
-        logging.StreamHandler()
-    ]
+import win32con
+
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib json module
+    orjson = None
+
+# Configure logging: callers only enqueue records, a background listener does the I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_file_handler = logging.FileHandler(os.path.join(os.path.expanduser("~"), "recoil_controller.log"))
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+log_listener = QueueListener(
+    _log_queue,
+    # Batch file writes; errors and above are flushed immediately
+    MemoryHandler(64, flushLevel=logging.ERROR, target=_log_file_handler),
+    _log_stream_handler,
 )
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(QueueHandler(_log_queue))
+log_listener.start()
 logger = logging.getLogger("RecoilController")
 
+
+def slot_guard(message: str):
+    """Log and swallow exceptions from a Qt slot so one failure can't take down the event loop"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error("%s: %s", message, e)
+        return wrapper
+    return decorator
+
 PRESET_PATH = os.path.join(os.path.expanduser("~"), ".macro_presets_xyz_roblox.json")
 
-# Windows raw delta mouse move
-def move_mouse_raw(dx: int, dy: int):
-    try:
-        win32api.mouse_event(win32con.MOUSEEVENTF_MOVE, dx, dy, 0, 0)
-    except Exception as e:
-        logger.error(f"Mouse movement failed: {str(e)}")
+# Preset file (de)serialization, bytes in and out
+if orjson is not None:
+    def dumps_json(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    loads_json = orjson.loads
+else:
+    def dumps_json(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    loads_json = json.loads
 
-def scroll_mouse(amount: int):
-    try:
-        win32api.mouse_event(win32con.MOUSEEVENTF_WHEEL, 0, 0, amount * 120, 0)
-    except Exception as e:
-        logger.error(f"Mouse scroll failed: {str(e)}")
+# Worker accumulators are Q16.16 fixed-point ints
+FIXED_SHIFT = 16
+FIXED_ONE = 1 << FIXED_SHIFT
+FIXED_FRAC_MASK = FIXED_ONE - 1
+
+# SendInput structures (keyboard/hardware union members are unused; MOUSEINPUT is the largest)
+INPUT_MOUSE = 0
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT)]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUTUNION)]
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_winmm = ctypes.WinDLL("winmm")
+_SendInput = _user32.SendInput
+_SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(INPUT), ctypes.c_int)
+_SendInput.restype = ctypes.c_uint
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+_MOVE = win32con.MOUSEEVENTF_MOVE
+_WHEEL = win32con.MOUSEEVENTF_WHEEL
+
+# One INPUT reused for every call; only the compensator worker sends input, so no locking
+_input = INPUT(INPUT_MOUSE)
+_input_mi = _input.u.mi  # Shares _input's buffer
+_input_ptr = ctypes.pointer(_input)
+
+# Windows raw delta mouse move and wheel scroll in a single SendInput call
+def send_mouse(dx: int, dy: int, wheel: int = 0):
+    flags = 0
+    if dx or dy:
+        flags |= _MOVE
+    if wheel:
+        flags |= _WHEEL
+    mi = _input_mi
+    mi.dx = dx
+    mi.dy = dy
+    mi.mouseData = (wheel * 120) & 0xFFFFFFFF
+    mi.dwFlags = flags
+    if not _SendInput(1, _input_ptr, _INPUT_SIZE):
+        logger.error("SendInput failed: %s", ctypes.WinError(ctypes.get_last_error()))
+
+# Low-level mouse hook (WH_MOUSE_LL) plumbing
+LRESULT = ctypes.c_ssize_t
+LowLevelMouseProc = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+_kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+_user32.SetWindowsHookExW.argtypes = (ctypes.c_int, LowLevelMouseProc, wintypes.HINSTANCE, wintypes.DWORD)
+_user32.SetWindowsHookExW.restype = wintypes.HHOOK
+_user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+_user32.CallNextHookEx.restype = LRESULT
+_CallNextHookEx = _user32.CallNextHookEx
+_user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+_user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+_user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+_user32.GetMessageW.restype = wintypes.BOOL
+_user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+_user32.PostThreadMessageW.restype = wintypes.BOOL
+
+# Button messages forwarded to Python; everything else (notably WM_MOUSEMOVE) is passed straight on
+_WM_MOUSEMOVE = win32con.WM_MOUSEMOVE
+_BUTTON_MESSAGES = {
+    win32con.WM_LBUTTONDOWN: (mouse.Button.left, True),
+    win32con.WM_LBUTTONUP: (mouse.Button.left, False),
+    win32con.WM_RBUTTONDOWN: (mouse.Button.right, True),
+    win32con.WM_RBUTTONUP: (mouse.Button.right, False),
+}
 
 
 @dataclass
 class Preset:
+    __slots__ = ("name", "move_x", "move_y", "move_z")
+
     name: str
     move_x: float
     move_y: float
     move_z: float
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {"name": self.name, "move_x": self.move_x, "move_y": self.move_y, "move_z": self.move_z}
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Preset":
+        try:
+            return Preset(d["name"], float(d["move_x"]), float(d["move_y"]), float(d["move_z"]))
+        except KeyError:
+            pass
+        # Older or hand-edited files may omit fields
         return Preset(
             name=d.get("name", "preset"),
             move_x=float(d.get("move_x", 0.0)),
@@ -67,90 +186,181 @@ class Preset:
         )
 
 
+def write_presets_file(presets: Dict[str, Preset]):
+    data = dumps_json({name: p.to_dict() for name, p in presets.items()})
+    # Serialize up front, then one write and an atomic rename on commit
+    f = QSaveFile(PRESET_PATH)
+    if not f.open(QIODevice.WriteOnly):
+        raise OSError(f.errorString())
+    f.write(data)
+    if not f.commit():
+        raise OSError(f.errorString())
+
+
+class PresetSaveTask(QRunnable):
+    """Writes a snapshot of the presets on a pool thread; failures are logged, not shown"""
+
+    def __init__(self, presets: Dict[str, Preset]):
+        super().__init__()
+        self.presets = presets
+
+    def run(self):
+        try:
+            write_presets_file(self.presets)
+            logger.info("Presets saved")
+        except Exception as e:
+            logger.error("Failed saving presets: %s", e)
+
+
 class CompensatorWorker(QThread):
+    """Runs compensation bursts off the GUI thread so repaints and dialogs can't delay a tick"""
+
     status = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, active_event: Event, crouch_event: Event, crouch_factor_getter):
+    def __init__(self, active_event: Event):
         super().__init__()
         self.active_event = active_event
-        self.crouch_event = crouch_event
         self._stop_event = Event()
-        self.preset: Optional[Preset] = None
-        self._accum_x = 0.0
-        self._accum_y = 0.0
-        self._accum_z = 0.0
-        self.get_crouch_factor = crouch_factor_getter
-        self.preset_lock = Lock()
-        self.shot_fired = False  # Flag to track when a shot is fired
+        self._deltas = (0, 0, 0)  # Per-tick X/Y/Z movement in fixed-point, crouch factor applied
+        self.compensation_interval = 0.005  # Faster update rate for more responsive compensation
+        self._shot_event = Event()  # Set while a shot's compensation burst is pending
         self.last_shot_time = 0  # Track time of last shot
 
-    def set_preset(self, preset: Preset):
-        with self.preset_lock:
-            self.preset = preset
+    def set_deltas(self, dx: float, dy: float, dz: float):
+        # Called straight from GUI slots: a plain reference swap that never blocks,
+        # and run() snapshots self._deltas once per tick
+        self._deltas = (round(dx * FIXED_ONE), round(dy * FIXED_ONE), round(dz * FIXED_ONE))
 
-    def stop(self):
+    def request_stop(self):
+        # Non-blocking; pair with stop() or wait() to join
         self._stop_event.set()
         self.active_event.clear()
+        self._shot_event.set()  # Wake the idle wait so run() sees the stop request
+
+    def stop(self):
+        self.request_stop()
         if not self.wait(2000):  # Wait up to 2 seconds for thread to finish
             logger.warning("Worker thread did not terminate gracefully")
             
     def trigger_shot(self):
         """Called when a shot is fired to apply compensation"""
-        self.shot_fired = True
-        self.last_shot_time = time.time()
+        self.last_shot_time = time.perf_counter()
+        self._shot_event.set()
 
     def run(self):
-        step_sleep = 0.005  # Faster update rate for more responsive compensation
         logger.info("Compensator worker started")
+        interval = self.compensation_interval
+        stop_is_set = self._stop_event.is_set
+        shot_is_set = self._shot_event.is_set
+        active_is_set = self.active_event.is_set
+        _sleep = time.sleep
+        _now = time.perf_counter
+        _send = send_mouse
+        # Sub-pixel remainders carry across bursts; kept in locals so a tick does no attribute traffic
+        accum_x = accum_y = accum_z = 0
         try:
-            while not self._stop_event.is_set():
+            while not stop_is_set():
+                # Block until a shot is fired instead of polling while idle
+                if not self._shot_event.wait(timeout=0.5):
+                    continue
+
+                # Raise the system timer resolution to 1 ms only while a burst is running
+                _winmm.timeBeginPeriod(1)
                 try:
-                    if self.active_event.is_set() and self.preset and self.shot_fired:
-                        # Apply recoil compensation when a shot is fired
-                        factor = self.get_crouch_factor() if self.crouch_event.is_set() else 1.0
-                        
-                        # Use lock when accessing preset
-                        with self.preset_lock:
+                    next_tick = _now()
+                    while shot_is_set() and not stop_is_set():
+                        if active_is_set():
                             # Apply compensation all at once for immediate effect
-                            self._accum_x += self.preset.move_x * factor
-                            self._accum_y += self.preset.move_y * factor
-                            self._accum_z += self.preset.move_z * factor
-
-                        # Extract integer parts to move/scroll
-                        move_x_int = int(self._accum_x)
-                        move_y_int = int(self._accum_y)
-                        move_z_int = int(self._accum_z)
-
-                        # Subtract sent integers from accumulator
-                        self._accum_x -= move_x_int
-                        self._accum_y -= move_y_int
-                        self._accum_z -= move_z_int
-
-                        # Send raw movement deltas so Roblox detects it in mouse lock
-                        if move_x_int != 0 or move_y_int != 0:
-                            move_mouse_raw(move_x_int, move_y_int)
-
-                        # Scroll if Z != 0
-                        if move_z_int != 0:
-                            scroll_mouse(move_z_int)
+                            dx, dy, dz = self._deltas
+                            accum_x += dx
+                            accum_y += dy
+                            accum_z += dz
+
+                            # Extract integer parts to move/scroll
+                            move_x_int = accum_x >> FIXED_SHIFT
+                            move_y_int = accum_y >> FIXED_SHIFT
+                            move_z_int = accum_z >> FIXED_SHIFT
+
+                            # Keep only the fractional part in the accumulator
+                            accum_x &= FIXED_FRAC_MASK
+                            accum_y &= FIXED_FRAC_MASK
+                            accum_z &= FIXED_FRAC_MASK
+
+                            # Send raw movement deltas so Roblox detects it in mouse lock
+                            if move_x_int or move_y_int or move_z_int:
+                                _send(move_x_int, move_y_int, move_z_int)
                         
-                        # Reset shot flag after a short time (allows for rapid fire)
-                        if time.time() - self.last_shot_time > 0.05:
-                            self.shot_fired = False
-                    
-                    time.sleep(step_sleep)
+                        # End the burst a short time after the last shot (allows for rapid fire)
+                        if _now() - self.last_shot_time > 0.05:
+                            self._shot_event.clear()
+                            # Re-arm if a shot landed between the check and the clear
+                            if _now() - self.last_shot_time <= 0.05:
+                                self._shot_event.set()
+                        
+                        # Sleep to the next deadline so work time doesn't stretch the interval
+                        next_tick += interval
+                        delay = next_tick - _now()
+                        if delay > 0:
+                            _sleep(delay)
+                        else:
+                            next_tick = _now()  # Overran; re-sync instead of bursting to catch up
                 except Exception as e:
-                    logger.error(f"Error in worker loop: {str(e)}")
+                    logger.error("Error in worker loop: %s", e)
                     self.error.emit(f"Worker error: {str(e)}")
                     time.sleep(1)  # Prevent tight error loop
+                finally:
+                    _winmm.timeEndPeriod(1)
         except Exception as e:
-            logger.critical(f"Critical error in worker thread: {str(e)}")
+            logger.critical("Critical error in worker thread: %s", e)
             self.error.emit(f"Critical worker error: {str(e)}")
         finally:
             logger.info("Compensator worker stopped")
 
 
+class MouseHookThread(QThread):
+    """Owns a WH_MOUSE_LL hook and the message pump it needs to be called"""
+
+    def __init__(self, on_click):
+        super().__init__()
+        self.on_click = on_click
+        self._thread_id = 0
+        self._proc = LowLevelMouseProc(self._hook_proc)  # Must outlive the hook
+
+    def _hook_proc(self, n_code, w_param, l_param):
+        # Moves dominate the hook traffic on high polling-rate mice; forward them before anything else
+        if w_param == _WM_MOUSEMOVE:
+            return _CallNextHookEx(None, n_code, w_param, l_param)
+        if n_code >= 0:
+            hit = _BUTTON_MESSAGES.get(w_param)
+            if hit is not None:
+                self.on_click(*hit)
+        return _CallNextHookEx(None, n_code, w_param, l_param)
+
+    def run(self):
+        self._thread_id = _kernel32.GetCurrentThreadId()
+        hook = _user32.SetWindowsHookExW(win32con.WH_MOUSE_LL, self._proc, _kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            logger.error("Failed to install mouse hook: %s", ctypes.WinError(ctypes.get_last_error()))
+            return
+        try:
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            _user32.UnhookWindowsHookEx(hook)
+
+    def request_stop(self):
+        # Non-blocking; the pump exits on WM_QUIT and unhooks
+        if self._thread_id:
+            _user32.PostThreadMessageW(self._thread_id, win32con.WM_QUIT, 0, 0)
+
+    def stop(self):
+        self.request_stop()
+        if not self.wait(2000):
+            logger.warning("Mouse hook thread did not terminate gracefully")
+
+
 class SafeMouseListener(QObject):
     button_pressed = pyqtSignal(mouse.Button, bool)
     
@@ -164,28 +374,32 @@ class SafeMouseListener(QObject):
             return
             
         self.running = True
-        self.listener = mouse.Listener(on_click=self.on_click)
-        self.listener.daemon = True
+        self.listener = MouseHookThread(self.on_click)
         self.listener.start()
         logger.info("Mouse listener started")
         
-    def stop(self):
+    def request_stop(self):
         if not self.running:
             return
             
         self.running = False
         if self.listener:
             try:
-                self.listener.stop()
+                self.listener.request_stop()
             except Exception as e:
-                logger.error(f"Error stopping mouse listener: {str(e)}")
+                logger.error("Error stopping mouse listener: %s", e)
+
+    def stop(self):
+        self.request_stop()
+        listener, self.listener = self.listener, None
+        if listener is None:
+            return
+        listener.stop()
         logger.info("Mouse listener stopped")
         
-    def on_click(self, x: int, y: int, button: mouse.Button, pressed: bool):
-        try:
-            self.button_pressed.emit(button, pressed)
-        except Exception as e:
-            logger.error(f"Error in mouse handler: {str(e)}")
+    @slot_guard("Error in mouse handler")
+    def on_click(self, button: mouse.Button, pressed: bool):
+        self.button_pressed.emit(button, pressed)
 
 
 class SafeKeyboardListener(QObject):
@@ -209,23 +423,45 @@ class SafeKeyboardListener(QObject):
         self.listener.start()
         logger.info("Keyboard listener started")
         
-    def stop(self):
+    def request_stop(self):
         if not self.running:
             return
             
         self.running = False
         if self.listener:
             try:
-                self.listener.stop()
+                self.listener.stop()  # pynput only signals here; the join happens in stop()
             except Exception as e:
-                logger.error(f"Error stopping keyboard listener: {str(e)}")
+                logger.error("Error stopping keyboard listener: %s", e)
+
+    def stop(self):
+        self.request_stop()
+        listener, self.listener = self.listener, None
+        if listener is None:
+            return
+        listener.join(2)
         logger.info("Keyboard listener stopped")
         
+    @slot_guard("Error in keyboard handler")
     def on_key(self, key, pressed):
-        try:
-            self.key_pressed.emit(key, pressed)
-        except Exception as e:
-            logger.error(f"Error in keyboard handler: {str(e)}")
+        self.key_pressed.emit(key, pressed)
+
+
+# Per-state status label stylesheets, built once and swapped in with setStyleSheet
+_STATUS_STYLE = """
+    QLabel {{
+        background-color: {};
+        color: white;
+        font-weight: bold;
+        padding: 8px;
+        border-radius: 4px;
+    }}
+"""
+STATUS_STYLES = {
+    "statusActive": _STATUS_STYLE.format("#4CAF50"),
+    "statusInactive": _STATUS_STYLE.format("#F44336"),
+    "statusError": _STATUS_STYLE.format("#FF9800"),
+}
 
 
 class MacroController(QWidget):
@@ -316,27 +552,6 @@ class MacroController(QWidget):
                 padding: 12px;
                 border-radius: 4px;
             }
-            #statusActive {
-                background-color: #4CAF50;
-                color: white;
-                font-weight: bold;
-                padding: 8px;
-                border-radius: 4px;
-            }
-            #statusInactive {
-                background-color: #F44336;
-                color: white;
-                font-weight: bold;
-                padding: 8px;
-                border-radius: 4px;
-            }
-            #statusError {
-                background-color: #FF9800;
-                color: white;
-                font-weight: bold;
-                padding: 8px;
-                border-radius: 4px;
-            }
             #presetControls {
                 background-color: #252526;
                 border: 1px solid #3C3C40;
@@ -353,7 +568,9 @@ class MacroController(QWidget):
         
         # Create status bar
         self.status_label = QLabel("Status: Initializing...")
-        self.status_label.setObjectName("statusInactive")
+        self.status_label.setStyleSheet(STATUS_STYLES["statusInactive"])
+        self._status_state = "statusInactive"
+        self._pending_status = None  # (text, state) held back while the window isn't on screen
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
         
@@ -509,9 +726,7 @@ class MacroController(QWidget):
 
         # Worker and events
         self.active_event = Event()
-        self.crouch_event = Event()
-        self.worker = CompensatorWorker(self.active_event, self.crouch_event, self.get_crouch_factor)
-        self.worker.error.connect(self.handle_worker_error)
+        self.worker: Optional[CompensatorWorker] = None  # Only exists while compensation is enabled
         
         # Safe listeners
         self.mouse_listener = SafeMouseListener()
@@ -520,10 +735,33 @@ class MacroController(QWidget):
         # State
         self.left_pressed = False
         self.right_pressed = False
-        self.pressed_keys = set()
         self.crouch_key = "ctrl"  # Default
+        self._crouch_held = False  # Only touched on the GUI thread
+        self.crouch_key_obj = keyboard.Key.ctrl  # Resolved pynput Key for crouch_key, if it names one
         self.presets: Dict[str, Preset] = {}
         
+        # Plain-float copies of the widget values, kept in sync so readers skip the PyQt boundary
+        self._move_x = self.move_x_spin.value()
+        self._move_y = self.move_y_spin.value()
+        self._move_z = self.move_z_spin.value()
+        self._crouch_factor = self.crouch_slider.value() / 100.0
+        self.move_x_spin.valueChanged.connect(lambda v: setattr(self, "_move_x", v))
+        self.move_y_spin.valueChanged.connect(lambda v: setattr(self, "_move_y", v))
+        self.move_z_spin.valueChanged.connect(lambda v: setattr(self, "_move_z", v))
+        self.crouch_slider.valueChanged.connect(lambda v: setattr(self, "_crouch_factor", v / 100.0))
+        
+        # Coalesce bursts of preset edits into a single file write
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self.save_presets_file)
+        
+        # Coalesce spinbox/slider storms into a single delta push to the worker
+        self._deltas_debounce = QTimer(self)
+        self._deltas_debounce.setSingleShot(True)
+        self._deltas_debounce.setInterval(120)
+        self._deltas_debounce.timeout.connect(self._recompute_deltas)
+        
         # Load presets after UI is ready
         QTimer.singleShot(100, self.initialize_application)
 
@@ -532,65 +770,85 @@ class MacroController(QWidget):
         try:
             self.load_presets()
             self.refresh_preset_list()
-            self.worker.start()
+            if self.enable_btn.isChecked():
+                self.start_worker()
             self.mouse_listener.start()
             self.keyboard_listener.start()
             self.connect_signals()
-            self.status_label.setText("Status: Ready")
+            self.set_status("Status: Ready", "statusActive" if self.enable_btn.isChecked() else "statusInactive")
             # Set default crouch key
-            self.crouch_key = self.crouch_key_edit.text().strip().lower()
+            self.crouch_key = sys.intern(self.crouch_key_edit.text().strip().lower())
+            self.crouch_key_obj = self.resolve_key(self.crouch_key)
             logger.info("Application initialized")
         except Exception as e:
-            logger.critical(f"Initialization failed: {str(e)}")
+            logger.critical("Initialization failed: %s", e)
             self.show_error(f"Initialization failed: {str(e)}")
-            self.status_label.setObjectName("statusError")
-            self.status_label.setText("Initialization failed!")
-            self.status_label.style().unpolish(self.status_label)
-            self.status_label.style().polish(self.status_label)
+            self.set_status("Initialization failed!", "statusError")
 
     def get_crouch_factor(self) -> float:
         # Return factor from slider percentage (0.0 to 1.0)
-        try:
-            return self.crouch_slider.value() / 100.0
-        except Exception as e:
-            logger.error(f"Error getting crouch factor: {str(e)}")
-            return 1.0
+        return self._crouch_factor
+
+    def start_worker(self):
+        if self.worker is not None and self.worker.isRunning():
+            return
+        self.worker = CompensatorWorker(self.active_event)
+        self.worker.error.connect(self.handle_worker_error)
+        self._recompute_deltas()
+        self.worker.start()
+
+    def stop_worker(self):
+        if self.worker is None:
+            return
+        self.worker.stop()
+        self.worker = None
+
+    def _schedule_deltas(self, *_):
+        # Restarting the timer defers the push until the value stops changing
+        self._deltas_debounce.start()
 
+    def _recompute_deltas(self):
+        # Fold the crouch factor into the per-tick deltas so the worker only adds them
+        if self.worker is None:
+            return
+        factor = self.get_crouch_factor() if self._crouch_held else 1.0
+        self.worker.set_deltas(
+            self._move_x * factor,
+            self._move_y * factor,
+            self._move_z * factor,
+        )
+
+    @slot_guard("Slider change error")
     def on_crouch_slider_changed(self, value: int):
-        try:
-            self.crouch_slider_label.setText(f"Crouch Reduction: {value}%")
-        except Exception as e:
-            logger.error(f"Slider change error: {str(e)}")
+        self.crouch_slider_label.setText(f"Crouch Reduction: {value}%")
 
     # ---------- Preset management ----------
+    @slot_guard("Failed to load presets")
     def load_presets(self):
-        try:
-            if os.path.exists(PRESET_PATH):
-                with open(PRESET_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                for name, pd in data.items():
-                    self.presets[name] = Preset.from_dict(pd)
-                logger.info(f"Loaded {len(self.presets)} presets")
-        except Exception as e:
-            logger.error(f"Failed to load presets: {str(e)}")
+        if os.path.exists(PRESET_PATH):
+            with open(PRESET_PATH, "rb") as f:
+                data = loads_json(f.read())
+            for name, pd in data.items():
+                self.presets[name] = Preset.from_dict(pd)
+            logger.info("Loaded %s presets", len(self.presets))
+
+    def schedule_presets_save(self):
+        # Restarting the timer pushes the write back until edits go quiet
+        self._save_timer.start()
 
     def save_presets_file(self):
         try:
-            data = {name: p.to_dict() for name, p in self.presets.items()}
-            with open(PRESET_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            write_presets_file(self.presets)
             logger.info("Presets saved")
         except Exception as e:
-            logger.error(f"Failed saving presets: {str(e)}")
+            logger.error("Failed saving presets: %s", e)
             self.show_error(f"Failed to save presets: {str(e)}")
 
+    @slot_guard("Error refreshing preset list")
     def refresh_preset_list(self):
-        try:
-            self.preset_list.clear()
-            for name in sorted(self.presets.keys()):
-                self.preset_list.addItem(name)
-        except Exception as e:
-            logger.error(f"Error refreshing preset list: {str(e)}")
+        self.preset_list.clear()
+        for name in sorted(self.presets.keys()):
+            self.preset_list.addItem(name)
 
     def save_current_preset(self):
         try:
@@ -601,19 +859,19 @@ class MacroController(QWidget):
                 
             p = Preset(
                 name=name,
-                move_x=self.move_x_spin.value(),
-                move_y=self.move_y_spin.value(),
-                move_z=self.move_z_spin.value(),
+                move_x=self._move_x,
+                move_y=self._move_y,
+                move_z=self._move_z,
             )
             
             self.presets[name] = p
-            self.save_presets_file()
+            self.schedule_presets_save()
             self.refresh_preset_list()
             self.save_name_edit.clear()
-            self.status_label.setText(f"Saved preset '{name}'")
-            logger.info(f"Saved preset: {name}")
+            self.set_status(f"Saved preset '{name}'")
+            logger.info("Saved preset: %s", name)
         except Exception as e:
-            logger.error(f"Error saving preset: {str(e)}")
+            logger.error("Error saving preset: %s", e)
             self.show_error(f"Failed to save preset: {str(e)}")
 
     def load_selected_preset(self):
@@ -628,14 +886,23 @@ class MacroController(QWidget):
             if not p:
                 return
                 
-            self.move_x_spin.setValue(p.move_x)
-            self.move_y_spin.setValue(p.move_y)
-            self.move_z_spin.setValue(p.move_z)
+            # Apply all three values silently, then refresh the caches and push deltas once
+            with ExitStack() as stack:
+                for spin in (self.move_x_spin, self.move_y_spin, self.move_z_spin):
+                    stack.enter_context(QSignalBlocker(spin))
+                self.move_x_spin.setValue(p.move_x)
+                self.move_y_spin.setValue(p.move_y)
+                self.move_z_spin.setValue(p.move_z)
+            # Read back rather than using p directly so range clamping and rounding match valueChanged
+            self._move_x = self.move_x_spin.value()
+            self._move_y = self.move_y_spin.value()
+            self._move_z = self.move_z_spin.value()
+            self._recompute_deltas()
                 
-            self.status_label.setText(f"Loaded preset '{name}'")
-            logger.info(f"Loaded preset: {name}")
+            self.set_status(f"Loaded preset '{name}'")
+            logger.info("Loaded preset: %s", name)
         except Exception as e:
-            logger.error(f"Error loading preset: {str(e)}")
+            logger.error("Error loading preset: %s", e)
             self.show_error(f"Failed to load preset: {str(e)}")
 
     def delete_selected_preset(self):
@@ -646,79 +913,63 @@ class MacroController(QWidget):
             name = item.text()
             if name in self.presets:
                 del self.presets[name]
-                self.save_presets_file()
+                self.schedule_presets_save()
                 self.refresh_preset_list()
-                self.status_label.setText(f"Deleted preset '{name}'")
-                logger.info(f"Deleted preset: {name}")
+                self.set_status(f"Deleted preset '{name}'")
+                logger.info("Deleted preset: %s", name)
         except Exception as e:
-            logger.error(f"Error deleting preset: {str(e)}")
+            logger.error("Error deleting preset: %s", e)
             self.show_error(f"Failed to delete preset: {str(e)}")
 
     # ---------- Mouse Listener ----------
+    @slot_guard("Mouse click error")
     def on_mouse_click(self, button: mouse.Button, pressed: bool):
-        try:
-            if button == mouse.Button.left:
-                self.left_pressed = pressed
-                if pressed and self.enable_btn.isChecked():
-                    # Apply compensation on each shot (left click)
-                    self.apply_compensation()
-                    
-            elif button == mouse.Button.right:
-                self.right_pressed = pressed
+        if button == mouse.Button.left:
+            self.left_pressed = pressed
+            if pressed and self.enable_btn.isChecked():
+                # Apply compensation on each shot (left click)
+                self.apply_compensation()
                 
-            # Update status label
-            if self.enable_btn.isChecked():
-                if pressed:
-                    self.status_label.setObjectName("statusActive")
-                    self.status_label.setText("Compensation active")
-                    self.status_label.style().unpolish(self.status_label)
-                    self.status_label.style().polish(self.status_label)
-                else:
-                    self.status_label.setObjectName("statusInactive")
-                    self.status_label.setText("Ready (waiting for next shot)")
-                    self.status_label.style().unpolish(self.status_label)
-                    self.status_label.style().polish(self.status_label)
-                    
-        except Exception as e:
-            logger.error(f"Mouse click error: {str(e)}")
+        elif button == mouse.Button.right:
+            self.right_pressed = pressed
+            
+        # Update status label; the style only changes when recovering from another state
+        if self.enable_btn.isChecked():
+            if pressed:
+                self.set_status("Compensation active", "statusActive")
+            else:
+                self.set_status("Ready (waiting for next shot)", "statusActive")
             
+    @slot_guard("Compensation error")
     def apply_compensation(self):
         """Apply recoil compensation for a single shot"""
-        try:
-            if not self.enable_btn.isChecked():
-                return
-                
-            # Create preset from current settings
-            p = Preset(
-                name="live",
-                move_x=self.move_x_spin.value(),
-                move_y=self.move_y_spin.value(),
-                move_z=self.move_z_spin.value(),
-            )
+        if not self.enable_btn.isChecked():
+            return
             
-            # Set active and trigger compensation
-            self.worker.set_preset(p)
-            self.active_event.set()
-            self.worker.trigger_shot()
+        worker = self.worker
+        if worker is None:
+            return
             
-        except Exception as e:
-            logger.error(f"Compensation error: {str(e)}")
+        # Set active and trigger compensation
+        self.active_event.set()
+        worker.trigger_shot()
 
     # ---------- Keyboard Listener ----------
+    @slot_guard("Key action error")
     def on_key_action(self, key, pressed):
-        try:
-            k = self.key_to_str(key)
-            if pressed:
-                self.pressed_keys.add(k)
-                if self.crouch_key and k == self.crouch_key:
-                    self.crouch_event.set()
-            else:
-                if k in self.pressed_keys:
-                    self.pressed_keys.remove(k)
-                if self.crouch_key and k == self.crouch_key:
-                    self.crouch_event.clear()
-        except Exception as e:
-            logger.error(f"Key action error: {str(e)}")
+        # Only the crouch key matters; named keys are singletons so identity is enough
+        if self.crouch_key_obj is not None:
+            if key is not self.crouch_key_obj:
+                return
+        elif not self.crouch_key or self.key_to_str(key) != self.crouch_key:
+            return
+        if pressed != self._crouch_held:
+            self._crouch_held = pressed
+            self._recompute_deltas()
+
+    def resolve_key(self, name):
+        # Map names like "ctrl" or "shift" to their pynput Key member; characters resolve to None
+        return keyboard.Key.__members__.get(name) if name else None
 
     def key_to_str(self, key):
         try:
@@ -726,7 +977,8 @@ class MacroController(QWidget):
             if hasattr(key, "char") and key.char is not None:
                 return key.char.lower()
             elif hasattr(key, "name"):
-                return key.name.lower()
+                # Interned so the compare against crouch_key is a pointer check
+                return sys.intern(key.name.lower())
             elif hasattr(key, "_name_"):
                 return key._name_.lower()
             else:
@@ -738,105 +990,176 @@ class MacroController(QWidget):
                     return key_str.split("keycode.")[-1]
                 return key_str
         except Exception as e:
-            logger.error(f"Key conversion error: {str(e)}")
+            logger.error("Key conversion error: %s", e)
             return "unknown"
 
+    @slot_guard("Crouch key change error")
     def on_crouch_key_changed(self, text: str):
-        try:
-            key = text.strip().lower()
-            if not key:
-                self.crouch_key = None
-                self.status_label.setText("Crouch key cleared")
-                self.crouch_event.clear()
-            else:
-                self.crouch_key = key
-                self.status_label.setText(f"Crouch key set to '{key}'")
-        except Exception as e:
-            logger.error(f"Crouch key change error: {str(e)}")
+        key = text.strip().lower()
+        if (key or None) == self.crouch_key:
+            return  # editingFinished also fires on focus loss with nothing changed
+        if not key:
+            self.crouch_key = None
+            self.crouch_key_obj = None
+            self.set_status("Crouch key cleared")
+            self._crouch_held = False
+            self._recompute_deltas()
+        else:
+            self.crouch_key = sys.intern(key)
+            self.crouch_key_obj = self.resolve_key(key)
+            self.set_status(f"Crouch key set to '{key}'")
 
+    @slot_guard("Toggle error")
     def on_toggle_enabled(self, enabled: bool):
-        try:
-            if enabled:
-                self.status_label.setText("Compensation Enabled")
-                self.enable_btn.setText("Disable Compensation")
-            else:
-                self.status_label.setText("Compensation Disabled")
-                self.enable_btn.setText("Enable Compensation")
-                self.active_event.clear()
-        except Exception as e:
-            logger.error(f"Toggle error: {str(e)}")
+        if enabled:
+            self.set_status("Compensation Enabled", "statusActive")
+            self.enable_btn.setText("Disable Compensation")
+            self.start_worker()
+        else:
+            self.set_status("Compensation Disabled", "statusInactive")
+            self.enable_btn.setText("Enable Compensation")
+            self.stop_worker()  # Also clears active_event
 
+    @slot_guard("Signal connection error")
     def connect_signals(self):
-        try:
-            # Connect UI signals
-            self.save_btn.clicked.connect(self.save_current_preset)
-            self.load_btn.clicked.connect(self.load_selected_preset)
-            self.delete_btn.clicked.connect(self.delete_selected_preset)
-            self.enable_btn.toggled.connect(self.on_toggle_enabled)
-            self.preset_list.itemDoubleClicked.connect(self.load_selected_preset)
-            self.crouch_key_edit.textChanged.connect(self.on_crouch_key_changed)
-            self.crouch_slider.valueChanged.connect(self.on_crouch_slider_changed)
-            
-            # Connect input listeners
-            self.mouse_listener.button_pressed.connect(self.on_mouse_click)
-            self.keyboard_listener.key_pressed.connect(self.on_key_action)
-            logger.info("Signals connected")
-        except Exception as e:
-            logger.error(f"Signal connection error: {str(e)}")
+        # Connect UI signals
+        self.save_btn.clicked.connect(self.save_current_preset)
+        self.load_btn.clicked.connect(self.load_selected_preset)
+        self.delete_btn.clicked.connect(self.delete_selected_preset)
+        self.enable_btn.toggled.connect(self.on_toggle_enabled)
+        self.preset_list.itemDoubleClicked.connect(self.load_selected_preset)
+        # Apply the key once it's committed (Enter or focus loss), not on every keystroke
+        self.crouch_key_edit.editingFinished.connect(
+            lambda: self.on_crouch_key_changed(self.crouch_key_edit.text())
+        )
+        self.crouch_slider.valueChanged.connect(self.on_crouch_slider_changed)
+        self.crouch_slider.valueChanged.connect(self._schedule_deltas)
+        self.move_x_spin.valueChanged.connect(self._schedule_deltas)
+        self.move_y_spin.valueChanged.connect(self._schedule_deltas)
+        self.move_z_spin.valueChanged.connect(self._schedule_deltas)
+        
+        # Connect input listeners
+        self.mouse_listener.button_pressed.connect(self.on_mouse_click)
+        self.keyboard_listener.key_pressed.connect(self.on_key_action)
+        logger.info("Signals connected")
 
+    @slot_guard("Error handling worker error")
     def handle_worker_error(self, message):
-        try:
-            self.status_label.setObjectName("statusError")
-            self.status_label.setText(message)
-            self.status_label.style().unpolish(self.status_label)
-            self.status_label.style().polish(self.status_label)
-            logger.error(f"Worker error: {message}")
-        except Exception as e:
-            logger.error(f"Error handling worker error: {str(e)}")
+        self.set_status(message, "statusError")
+        logger.error("Worker error: %s", message)
+
+    def set_status(self, text: str, state: Optional[str] = None):
+        if self.isMinimized() or not self.isVisible():
+            # Nothing is painted; keep the latest status and apply it once the window is back
+            if state is None and self._pending_status is not None:
+                state = self._pending_status[1]
+            self._pending_status = (text, state)
+            return
+        self.apply_status(text, state)
+
+    def apply_status(self, text: str, state: Optional[str] = None):
+        # Swap in the cached per-state stylesheet instead of re-polishing against the window's rules
+        if state is not None and state != self._status_state:
+            self._status_state = state
+            self.status_label.setStyleSheet(STATUS_STYLES[state])
+        self.status_label.setText(text)
+
+    def flush_pending_status(self):
+        if self._pending_status is not None:
+            text, state = self._pending_status
+            self._pending_status = None
+            self.apply_status(text, state)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.flush_pending_status()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Restoring from the taskbar doesn't always come with a showEvent
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self.flush_pending_status()
 
     def show_error(self, message):
         QMessageBox.critical(self, "Error", message)
 
+    @slot_guard("Shutdown error")
     def closeEvent(self, event):
         try:
             logger.info("Shutting down application")
-            self.worker.stop()
+            # Signal every thread first so their shutdowns overlap, then join them
+            worker, self.worker = self.worker, None
+            if worker is not None:
+                worker.request_stop()
+            self.mouse_listener.request_stop()
+            self.keyboard_listener.request_stop()
+            pool = QThreadPool.globalInstance()
+            if self._save_timer.isActive():
+                # Flush the pending debounced write alongside the joins
+                self._save_timer.stop()
+                pool.start(PresetSaveTask(dict(self.presets)))
+            if worker is not None:
+                worker.stop()
             self.mouse_listener.stop()
             self.keyboard_listener.stop()
-            self.save_presets_file()
+            pool.waitForDone()
             logger.info("Application shutdown complete")
-        except Exception as e:
-            logger.error(f"Shutdown error: {str(e)}")
         finally:
             event.accept()
 
 
+# Dark theme palette roles and their colors, constructed once at import
+_WHITE = QColor(Qt.white)
+_RED = QColor(Qt.red)
+_ACCENT = QColor(0, 122, 204)
+_LIGHT_TEXT = QColor(220, 220, 220)
+_DARK_BG = QColor(45, 45, 48)
+PALETTE_COLORS = (
+    (QPalette.Window, _DARK_BG),
+    (QPalette.WindowText, _LIGHT_TEXT),
+    (QPalette.Base, QColor(37, 37, 38)),
+    (QPalette.AlternateBase, _DARK_BG),
+    (QPalette.ToolTipBase, _ACCENT),
+    (QPalette.ToolTipText, _WHITE),
+    (QPalette.Text, _LIGHT_TEXT),
+    (QPalette.Button, QColor(60, 60, 64)),
+    (QPalette.ButtonText, _LIGHT_TEXT),
+    (QPalette.BrightText, _RED),
+    (QPalette.Highlight, _ACCENT),
+    (QPalette.HighlightedText, _WHITE),
+)
+
+_PALETTE: Optional[QPalette] = None
+
+
+def build_palette() -> QPalette:
+    # Built once and reused if main() runs again in the same process
+    global _PALETTE
+    if _PALETTE is None:
+        palette = QPalette()
+        set_color = palette.setColor
+        for role, color in PALETTE_COLORS:
+            set_color(role, color)
+        _PALETTE = palette
+    return _PALETTE
+
+
 def main():
     app = QApplication(sys.argv)
     
     # Set application style
     app.setStyle("Fusion")
     
-    # Create and customize palette
-    palette = QPalette()
-    palette.setColor(QPalette.Window, QColor(45, 45, 48))
-    palette.setColor(QPalette.WindowText, QColor(220, 220, 220))
-    palette.setColor(QPalette.Base, QColor(37, 37, 38))
-    palette.setColor(QPalette.AlternateBase, QColor(45, 45, 48))
-    palette.setColor(QPalette.ToolTipBase, QColor(0, 122, 204))
-    palette.setColor(QPalette.ToolTipText, Qt.white)
-    palette.setColor(QPalette.Text, QColor(220, 220, 220))
-    palette.setColor(QPalette.Button, QColor(60, 60, 64))
-    palette.setColor(QPalette.ButtonText, QColor(220, 220, 220))
-    palette.setColor(QPalette.BrightText, Qt.red)
-    palette.setColor(QPalette.Highlight, QColor(0, 122, 204))
-    palette.setColor(QPalette.HighlightedText, Qt.white)
-    
-    app.setPalette(palette)
+    app.setPalette(build_palette())
     
     w = MacroController()
     w.show()
-    sys.exit(app.exec_())
+    try:
+        exit_code = app.exec_()
+    finally:
+        # Drain queued records before the interpreter exits
+        log_listener.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":